@@ -8,12 +8,51 @@ import logging
 import os
 import ssl
 import time
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, List, Optional, Tuple
 
 import tzlocal
 from aiohttp import web
 
-import emulated_hue.const as const
+from emulated_hue.const import (
+    DEFAULT_THROTTLE_MS,
+    HASS,
+    HASS_ATTR,
+    HASS_ATTR_BRI_MIN,
+    HASS_ATTR_BRIGHTNESS,
+    HASS_ATTR_COLOR_TEMP,
+    HASS_ATTR_EFFECT,
+    HASS_ATTR_ENTITY_ID,
+    HASS_ATTR_FLASH,
+    HASS_ATTR_HS_COLOR,
+    HASS_ATTR_SUPPORTED_COLOR_MODES,
+    HASS_ATTR_TRANSITION,
+    HASS_ATTR_XY_COLOR,
+    HASS_COLOR_MODE_BRIGHTNESS,
+    HASS_COLOR_MODE_COLOR_TEMP,
+    HASS_COLOR_MODE_HS,
+    HASS_COLOR_MODE_RGB,
+    HASS_COLOR_MODE_RGBW,
+    HASS_COLOR_MODE_RGBWW,
+    HASS_COLOR_MODE_WHITE,
+    HASS_COLOR_MODE_XY,
+    HASS_DOMAIN_LIGHT,
+    HASS_SERVICE_TURN_OFF,
+    HASS_SERVICE_TURN_ON,
+    HASS_STATE_ON,
+    HASS_STATE_UNAVAILABLE,
+    HUE_ATTR_ALERT,
+    HUE_ATTR_BRI,
+    HUE_ATTR_COLORMODE,
+    HUE_ATTR_CT,
+    HUE_ATTR_EFFECT,
+    HUE_ATTR_HUE,
+    HUE_ATTR_HUE_MAX,
+    HUE_ATTR_ON,
+    HUE_ATTR_SAT,
+    HUE_ATTR_SAT_MAX,
+    HUE_ATTR_TRANSITION,
+    HUE_ATTR_XY,
+)
 from emulated_hue.entertainment import EntertainmentAPI
 from emulated_hue.ssl_cert import async_generate_selfsigned_cert, check_certificate
 from emulated_hue.utils import (
@@ -30,6 +69,48 @@ LOGGER = logging.getLogger(__name__)
 STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_static")
 DESCRIPTION_FILE = os.path.join(STATIC_DIR, "description.xml")
 
+# HA color modes which provide color (hs/xy) or white (ct) control on the Hue side
+COLOR_MODES_COLOR = frozenset(
+    (
+        HASS_COLOR_MODE_HS,
+        HASS_COLOR_MODE_XY,
+        HASS_COLOR_MODE_RGB,
+        HASS_COLOR_MODE_RGBW,
+        HASS_COLOR_MODE_RGBWW,
+    )
+)
+COLOR_MODES_WHITE = frozenset(
+    (
+        HASS_COLOR_MODE_COLOR_TEMP,
+        HASS_COLOR_MODE_RGBW,
+        HASS_COLOR_MODE_RGBWW,
+        HASS_COLOR_MODE_WHITE,
+    )
+)
+
+# Hue light state attributes reported for each Hue light type
+LIGHT_TYPE_STATE_ATTRS = {
+    "Extended color light": (
+        HUE_ATTR_BRI,
+        HUE_ATTR_XY,
+        HUE_ATTR_HUE,
+        HUE_ATTR_SAT,
+        HUE_ATTR_CT,
+    ),
+    "Color light": (HUE_ATTR_BRI, HUE_ATTR_XY, HUE_ATTR_HUE, HUE_ATTR_SAT),
+    "Color temperature light": (HUE_ATTR_BRI, HUE_ATTR_CT),
+    "Dimmable light": (HUE_ATTR_BRI,),
+    "On/off light": (),
+}
+
+# Hue light state attributes which map directly to a HA attribute, with defaults
+# NOTE: the defaults end up in the light state, they must never be mutated
+ENTITY_STATE_ATTRS = (
+    (HUE_ATTR_BRI, HASS_ATTR_BRIGHTNESS, 0),
+    (HUE_ATTR_XY, HASS_ATTR_XY_COLOR, [0, 0]),
+    (HUE_ATTR_CT, HASS_ATTR_COLOR_TEMP, 0),
+)
+
 
 class ClassRouteTableDef(web.RouteTableDef):
     """Allow decorators for route registering within class methods."""
@@ -74,7 +155,8 @@ def check_request(check_user=True, log_request=True):
     def func_wrapper(func):
         @functools.wraps(func)
         async def wrapped_func(cls, request: web.Request):
-            if log_request:
+            # only resolve the request details for logging when debug logging is on
+            if log_request and LOGGER.isEnabledFor(logging.DEBUG):
                 LOGGER.debug("[%s] %s %s", request.remote, request.method, request.path)
             # check username
             if check_user:
@@ -109,8 +191,11 @@ class HueApi:
         self.http_site = None
         self.https_site = None
         self._new_lights = {}
-        self._timestamps = {}
-        self._prev_data = {}
+        # last light data and throttle deadline per entity, kept in one lookup
+        self._prev_state = {}
+        self._device_details = {}
+        # the definitions are static, resolve the light types only once
+        self._light_definitions = self.config.definitions["lights"]
         with open(DESCRIPTION_FILE, encoding="utf-8") as fdesc:
             self._description_xml = fdesc.read()
 
@@ -297,15 +382,19 @@ class HueApi:
             scene = await self.config.async_get_storage_value(
                 "scenes", request_data["scene"], default={}
             )
+            light_actions = []
             for light_id, light_state in scene["lightstates"].items():
                 entity = await self.config.async_entity_by_light_id(light_id)
-                await self.__async_light_action(entity, light_state)
+                light_actions.append((entity, light_state))
         else:
             # forward request to all group lights
             # may need refactor to make __async_get_group_lights not an
             # async generator to instead return a dict
-            async for entity in self.__async_get_group_lights(group_id):
-                await self.__async_light_action(entity, request_data)
+            light_actions = [
+                (entity, request_data)
+                async for entity in self.__async_get_group_lights(group_id)
+            ]
+        await self.__async_lights_action(light_actions)
         if group_conf and "stream" in group_conf:
             # Request streaming stop
             # Duplicate code here. Method instead?
@@ -607,97 +696,144 @@ class HueApi:
 
     async def __async_light_action(self, entity: dict, request_data: dict) -> None:
         """Translate the Hue api request data to actions on a light entity."""
+        action = await self.__async_light_action_data(entity, request_data)
+        if action:
+            await self.hue.hass.call_service(HASS_DOMAIN_LIGHT, *action)
+
+    async def __async_lights_action(
+        self, light_actions: List[Tuple[dict, dict]]
+    ) -> None:
+        """Translate Hue api request data to actions on multiple light entities."""
+        # lights which end up with the exact same service data (e.g. all lights
+        # of a group) are combined into a single service call to Home Assistant
+        batches = {}
+        # lights of a group share the same request data, only convert it once
+        converted = {}
+        for entity, request_data in light_actions:
+            hass_data = converted.get(id(request_data))
+            if hass_data is None:
+                hass_data = converted[id(request_data)] = self.__hue_to_hass_data(
+                    request_data
+                )
+            action = await self.__async_light_action_data(
+                entity, request_data, hass_data
+            )
+            if not action:
+                continue
+            service, data = action
+            entity_id = data.pop(HASS_ATTR_ENTITY_ID)
+            key = (service, json.dumps(data, sort_keys=True))
+            if key in batches:
+                batches[key][2].append(entity_id)
+            else:
+                batches[key] = (service, data, [entity_id])
+        for service, data, entity_ids in batches.values():
+            data[HASS_ATTR_ENTITY_ID] = (
+                entity_ids[0] if len(entity_ids) == 1 else entity_ids
+            )
+            await self.hue.hass.call_service(HASS_DOMAIN_LIGHT, service, data)
+
+    async def __async_light_action_data(
+        self, entity: dict, request_data: dict, hass_data: Optional[dict] = None
+    ) -> Optional[Tuple[str, dict]]:
+        """Return the service and service data for a Hue api request to a light entity."""
 
         light_id = await self.config.async_entity_id_to_light_id(entity["entity_id"])
         light_conf = await self.config.async_get_light_config(light_id)
-        throttle_ms = light_conf.get("throttle", const.DEFAULT_THROTTLE_MS)
-
-        # Construct what we need to send to the service
-        data = {const.HASS_ATTR_ENTITY_ID: entity["entity_id"]}
+        # the stored throttle may be null, which would break the comparisons below
+        throttle_ms = light_conf.get("throttle") or DEFAULT_THROTTLE_MS
+        throttle_s = throttle_ms / 1000
+        throttle_ns = int(throttle_ms * 1000000)
 
-        power_on = request_data.get(const.HASS_STATE_ON, True)
+        power_on = request_data.get(HASS_STATE_ON, True)
 
         # throttle command to light
-        data_with_power = request_data.copy()
-        data_with_power[const.HASS_STATE_ON] = power_on
-        if not self.__update_allowed(entity, data_with_power, throttle_ms):
-            return
+        if not self.__update_allowed(entity, request_data, power_on, throttle_ns):
+            return None
 
-        service = (
-            const.HASS_SERVICE_TURN_ON if power_on else const.HASS_SERVICE_TURN_OFF
-        )
+        # Construct what we need to send to the service
+        data = {HASS_ATTR_ENTITY_ID: entity["entity_id"]}
+        service = HASS_SERVICE_TURN_ON if power_on else HASS_SERVICE_TURN_OFF
         if power_on:
+            if hass_data is None:
+                hass_data = self.__hue_to_hass_data(request_data)
+            data.update(hass_data)
 
-            # set the brightness, hue, saturation and color temp
-            if const.HUE_ATTR_BRI in request_data:
-                # Prevent 0 brightness from turning light off
-                request_bri = request_data[const.HUE_ATTR_BRI]
-                if request_bri < const.HASS_ATTR_BRI_MIN:
-                    request_bri = const.HASS_ATTR_BRI_MIN
-                data[const.HASS_ATTR_BRIGHTNESS] = request_bri
-
-            if const.HUE_ATTR_HUE in request_data or const.HUE_ATTR_SAT in request_data:
-                hue = request_data.get(const.HUE_ATTR_HUE, 0)
-                sat = request_data.get(const.HUE_ATTR_SAT, 0)
-                # Convert hs values to hass hs values
-                hue = int((hue / const.HUE_ATTR_HUE_MAX) * 360)
-                sat = int((sat / const.HUE_ATTR_SAT_MAX) * 100)
-                data[const.HASS_ATTR_HS_COLOR] = (hue, sat)
-
-            if const.HUE_ATTR_CT in request_data:
-                data[const.HASS_ATTR_COLOR_TEMP] = request_data[const.HUE_ATTR_CT]
-
-            if const.HUE_ATTR_XY in request_data:
-                data[const.HASS_ATTR_XY_COLOR] = request_data[const.HUE_ATTR_XY]
-
-            if const.HUE_ATTR_EFFECT in request_data:
-                data[const.HASS_ATTR_EFFECT] = request_data[const.HUE_ATTR_EFFECT]
-
-            if const.HUE_ATTR_ALERT in request_data:
-                if request_data[const.HUE_ATTR_ALERT] == "select":
-                    data[const.HASS_ATTR_FLASH] = "short"
-                elif request_data[const.HUE_ATTR_ALERT] == "lselect":
-                    data[const.HASS_ATTR_FLASH] = "long"
-                # HASS now requires a color target to be sent when flashing
-                # Use white color to indicate the light
-                data[const.HASS_ATTR_HS_COLOR] = (0, 0)
-
-        if const.HUE_ATTR_TRANSITION in request_data:
+        if HUE_ATTR_TRANSITION in request_data:
             # Duration of the transition from the light to the new state
             # is given as a multiple of 100ms and defaults to 4 (400ms).
-            if request_data[const.HUE_ATTR_TRANSITION] * 100 <= throttle_ms:
-                transitiontime = throttle_ms / 1000
+            if request_data[HUE_ATTR_TRANSITION] * 100 <= throttle_ms:
+                transitiontime = throttle_s
             else:
-                transitiontime = request_data[const.HUE_ATTR_TRANSITION] / 10
-            data[const.HASS_ATTR_TRANSITION] = transitiontime
+                transitiontime = request_data[HUE_ATTR_TRANSITION] / 10
+            data[HASS_ATTR_TRANSITION] = transitiontime
         else:
-            data[const.HASS_ATTR_TRANSITION] = (
-                0.4 if throttle_ms <= 400 else throttle_ms / 1000
-            )
-
-        # execute service
-        await self.hue.hass.call_service(const.HASS_DOMAIN_LIGHT, service, data)
+            data[HASS_ATTR_TRANSITION] = 0.4 if throttle_ms <= 400 else throttle_s
+
+        return service, data
+
+    def __hue_to_hass_data(self, request_data: dict) -> dict:
+        """Convert the light independent parts of Hue api request data to HASS data."""
+        data = {}
+
+        # set the brightness, hue, saturation and color temp
+        if HUE_ATTR_BRI in request_data:
+            # Prevent 0 brightness from turning light off
+            request_bri = request_data[HUE_ATTR_BRI]
+            if request_bri < HASS_ATTR_BRI_MIN:
+                request_bri = HASS_ATTR_BRI_MIN
+            data[HASS_ATTR_BRIGHTNESS] = request_bri
+
+        if HUE_ATTR_HUE in request_data or HUE_ATTR_SAT in request_data:
+            hue = request_data.get(HUE_ATTR_HUE, 0)
+            sat = request_data.get(HUE_ATTR_SAT, 0)
+            # Convert hs values to hass hs values
+            hue = int((hue / HUE_ATTR_HUE_MAX) * 360)
+            sat = int((sat / HUE_ATTR_SAT_MAX) * 100)
+            data[HASS_ATTR_HS_COLOR] = (hue, sat)
+
+        if HUE_ATTR_CT in request_data:
+            data[HASS_ATTR_COLOR_TEMP] = request_data[HUE_ATTR_CT]
+
+        if HUE_ATTR_XY in request_data:
+            data[HASS_ATTR_XY_COLOR] = request_data[HUE_ATTR_XY]
+
+        if HUE_ATTR_EFFECT in request_data:
+            data[HASS_ATTR_EFFECT] = request_data[HUE_ATTR_EFFECT]
+
+        if HUE_ATTR_ALERT in request_data:
+            if request_data[HUE_ATTR_ALERT] == "select":
+                data[HASS_ATTR_FLASH] = "short"
+            elif request_data[HUE_ATTR_ALERT] == "lselect":
+                data[HASS_ATTR_FLASH] = "long"
+            # HASS now requires a color target to be sent when flashing
+            # Use white color to indicate the light
+            data[HASS_ATTR_HS_COLOR] = (0, 0)
+
+        return data
 
     def __update_allowed(
-        self, entity: dict, light_data: dict, throttle_ms: int
+        self, entity: dict, request_data: dict, power_on: bool, throttle_ns: int
     ) -> bool:
         """Minimalistic form of throttling, only allow updates to a light within a timespan."""
 
-        if not throttle_ms:
+        if not throttle_ns:
             return True
 
-        prev_data = self._prev_data.get(entity["entity_id"], {})
+        # resolve the previous data for this light once and update it in place
+        entity_id = entity["entity_id"]
+        light_data = request_data.copy()
+        light_data[HASS_STATE_ON] = power_on
+        prev_data, deadline = self._prev_state.get(entity_id, (None, 0))
 
         # pass initial request to light
         if not prev_data:
-            self._prev_data[entity["entity_id"]] = light_data.copy()
+            self._prev_state[entity_id] = (light_data, 0)
             return True
 
         # force to update if power state changed
-        if (entity["state"] == const.HASS_STATE_ON) != light_data.get(
-            const.HASS_STATE_ON, True
-        ):
-            self._prev_data[entity["entity_id"]].update(light_data)
+        if (entity["state"] == HASS_STATE_ON) != power_on:
+            prev_data.update(light_data)
             return True
 
         # check if data changed
@@ -705,16 +841,16 @@ class HueApi:
         if prev_data == light_data:
             return False
 
-        self._prev_data[entity["entity_id"]].update(light_data)
+        prev_data.update(light_data)
 
         # check throttle timestamp so light commands are only sent once every X milliseconds
         # this is to not overload a light implementation in Home Assistant
-        prev_timestamp = self._timestamps.get(entity["entity_id"], 0)
-        cur_timestamp = int(time.time() * 1000)
-        time_diff = abs(cur_timestamp - prev_timestamp)
-        if time_diff >= throttle_ms:
+        # use the monotonic clock so wall clock adjustments can't break throttling,
+        # the time at which the next command is allowed is stored as integer ns
+        cur_timestamp = time.monotonic_ns()
+        if cur_timestamp >= deadline:
             # change allowed only if within throttle limit
-            self._timestamps[entity["entity_id"]] = cur_timestamp
+            self._prev_state[entity_id] = (prev_data, cur_timestamp + throttle_ns)
             return True
         return False
 
@@ -725,9 +861,10 @@ class HueApi:
         light_id: Optional[str] = None,
     ) -> dict:
         """Convert an entity to its Hue bridge JSON representation."""
-        entity_attr = entity_attributes_to_int(entity[const.HASS_ATTR])
-        entity_color_modes = entity[const.HASS_ATTR].get(
-            const.HASS_ATTR_SUPPORTED_COLOR_MODES, []
+        # attributes are converted in place, so read everything from this one dict
+        entity_attr = entity_attributes_to_int(entity[HASS_ATTR])
+        entity_color_modes = frozenset(
+            entity_attr.get(HASS_ATTR_SUPPORTED_COLOR_MODES) or ()
         )
         if not light_id:
             light_id = await self.config.async_entity_id_to_light_id(
@@ -738,12 +875,11 @@ class HueApi:
 
         retval = {
             "state": {
-                const.HUE_ATTR_ON: entity["state"] == const.HASS_STATE_ON,
-                "reachable": entity["state"] != const.HASS_STATE_UNAVAILABLE,
+                HUE_ATTR_ON: entity["state"] == HASS_STATE_ON,
+                "reachable": entity["state"] != HASS_STATE_UNAVAILABLE,
                 "mode": "homeautomation",
             },
-            "name": light_config["name"]
-            or entity[const.HASS_ATTR].get("friendly_name", ""),
+            "name": light_config["name"] or entity_attr.get("friendly_name", ""),
             "uniqueid": light_config["uniqueid"],
             "swupdate": {
                 "state": "noupdates",
@@ -753,167 +889,126 @@ class HueApi:
         }
 
         # Obtain newest color mode if possible, prioritizing HASS
-        if entity_attr.get("color_mode"):
-            latest_color_mode = convert_color_mode(
-                entity_attr.get("color_mode"), const.HASS
-            )
+        entity_color_mode = entity_attr.get("color_mode")
+        if entity_color_mode:
+            latest_color_mode = convert_color_mode(entity_color_mode, HASS)
         else:
-            latest_color_mode = light_config.get(const.HUE_ATTR_COLORMODE)
-        last_light_state = light_config.get("state", dict())
-        latest_brightness = entity_attr.get(
-            const.HASS_ATTR_BRIGHTNESS,
-            last_light_state.get(const.HUE_ATTR_BRI, 0),
-        )
-        latest_xy = entity_attr.get(
-            const.HASS_ATTR_XY_COLOR, last_light_state.get(const.HUE_ATTR_XY, [0, 0])
-        )
-        latest_hue = entity_attr.get(const.HASS_ATTR_HS_COLOR, [0, 0])[0]
-        latest_hue = (
-            latest_hue if latest_hue else last_light_state.get(const.HUE_ATTR_HUE, 0)
-        )
-        latest_sat = entity_attr.get(const.HASS_ATTR_HS_COLOR, [0, 0])[1]
-        latest_sat = (
-            latest_sat if latest_sat else last_light_state.get(const.HUE_ATTR_SAT, 0)
-        )
-        latest_ct = entity_attr.get(
-            const.HASS_ATTR_COLOR_TEMP, last_light_state.get(const.HUE_ATTR_CT, 0)
-        )
+            latest_color_mode = light_config.get(HUE_ATTR_COLORMODE)
+        # Obtain newest state values from HASS, fall back to last known light state
+        last_light_state = light_config.get("state") or {}
+        latest_state = {}
+        for hue_attr, hass_attr, default in ENTITY_STATE_ATTRS:
+            value = entity_attr.get(hass_attr)
+            if value is None:
+                value = last_light_state.get(hue_attr, default)
+            latest_state[hue_attr] = value
+        latest_hue, latest_sat = entity_attr.get(HASS_ATTR_HS_COLOR) or [0, 0]
+        latest_state[HUE_ATTR_HUE] = latest_hue or last_light_state.get(HUE_ATTR_HUE, 0)
+        latest_state[HUE_ATTR_SAT] = latest_sat or last_light_state.get(HUE_ATTR_SAT, 0)
 
         # Determine correct Hue type from HA supported features
-        if any(
-            color_mode
-            in [
-                const.HASS_COLOR_MODE_HS,
-                const.HASS_COLOR_MODE_XY,
-                const.HASS_COLOR_MODE_RGB,
-                const.HASS_COLOR_MODE_RGBW,
-                const.HASS_COLOR_MODE_RGBWW,
-            ]
-            for color_mode in entity_color_modes
-        ) and any(
-            color_mode
-            in [
-                const.HASS_COLOR_MODE_COLOR_TEMP,
-                const.HASS_COLOR_MODE_RGBW,
-                const.HASS_COLOR_MODE_RGBWW,
-                const.HASS_COLOR_MODE_WHITE,
-            ]
-            for color_mode in entity_color_modes
-        ):
+        supports_color = not entity_color_modes.isdisjoint(COLOR_MODES_COLOR)
+        if supports_color and not entity_color_modes.isdisjoint(COLOR_MODES_WHITE):
             # Extended Color light (Zigbee Device ID: 0x0210)
             # Same as Color light, but which supports additional setting of color temperature
-            retval.update(self.hue.config.definitions["lights"]["Extended color light"])
-            # get color temperature min/max values from HA attributes
-            ct_min = entity_attr.get("min_mireds", 153)
-            retval["capabilities"]["control"]["ct"]["min"] = ct_min
-            ct_max = entity_attr.get("max_mireds", 500)
-            retval["capabilities"]["control"]["ct"]["max"] = ct_max
-            retval["state"].update(
-                {
-                    const.HUE_ATTR_BRI: latest_brightness,
-                    const.HUE_ATTR_COLORMODE: latest_color_mode
-                    if latest_color_mode
-                    else "xy",
-                    # TODO: add hue/sat
-                    const.HUE_ATTR_XY: latest_xy,
-                    const.HUE_ATTR_HUE: latest_hue,
-                    const.HUE_ATTR_SAT: latest_sat,
-                    const.HUE_ATTR_CT: latest_ct,
-                    const.HUE_ATTR_EFFECT: entity_attr.get(
-                        const.HASS_ATTR_EFFECT, "none"
-                    ),
-                    const.HUE_ATTR_ALERT: "none",
-                }
-            )
-        elif any(
-            color_mode
-            in [
-                const.HASS_COLOR_MODE_HS,
-                const.HASS_COLOR_MODE_XY,
-                const.HASS_COLOR_MODE_RGB,
-            ]
-            for color_mode in entity_color_modes
-        ):
+            light_type = "Extended color light"
+            extra_state = {
+                HUE_ATTR_COLORMODE: latest_color_mode or "xy",
+                HUE_ATTR_EFFECT: entity_attr.get(HASS_ATTR_EFFECT, "none"),
+                HUE_ATTR_ALERT: "none",
+            }
+        elif supports_color:
             # Color light (Zigbee Device ID: 0x0200)
             # Supports on/off, dimming and color control (hue/saturation, enhanced hue, color loop and XY)
-            retval.update(self.hue.config.definitions["lights"]["Color light"])
-            retval["state"].update(
-                {
-                    const.HUE_ATTR_BRI: latest_brightness,
-                    const.HUE_ATTR_COLORMODE: latest_color_mode
-                    if latest_color_mode
-                    else "xy",
-                    const.HUE_ATTR_XY: latest_xy,
-                    const.HUE_ATTR_HUE: latest_hue,
-                    const.HUE_ATTR_SAT: latest_sat,
-                    const.HUE_ATTR_EFFECT: "none",
-                }
-            )
-        elif const.HASS_COLOR_MODE_COLOR_TEMP in entity_color_modes:
+            light_type = "Color light"
+            extra_state = {
+                HUE_ATTR_COLORMODE: latest_color_mode or "xy",
+                HUE_ATTR_EFFECT: "none",
+            }
+        elif HASS_COLOR_MODE_COLOR_TEMP in entity_color_modes:
             # Color temperature light (Zigbee Device ID: 0x0220)
             # Supports groups, scenes, on/off, dimming, and setting of a color temperature
-            retval.update(
-                self.hue.config.definitions["lights"]["Color temperature light"]
-            )
-            # get color temperature min/max values from HA attributes
-            ct_min = entity_attr.get("min_mireds", 153)
-            retval["capabilities"]["control"]["ct"]["min"] = ct_min
-            ct_max = entity_attr.get("max_mireds", 500)
-            retval["capabilities"]["control"]["ct"]["max"] = ct_max
-            retval["state"].update(
-                {
-                    const.HUE_ATTR_BRI: latest_brightness,
-                    const.HUE_ATTR_COLORMODE: latest_color_mode,
-                    const.HUE_ATTR_CT: latest_ct,
-                }
-            )
-        elif const.HASS_COLOR_MODE_BRIGHTNESS in entity_color_modes:
+            light_type = "Color temperature light"
+            extra_state = {HUE_ATTR_COLORMODE: latest_color_mode}
+        elif HASS_COLOR_MODE_BRIGHTNESS in entity_color_modes:
             # Dimmable light (Zigbee Device ID: 0x0100)
             # Supports groups, scenes, on/off and dimming
-            retval["type"] = "Dimmable light"
-            retval.update(self.hue.config.definitions["lights"]["Dimmable light"])
-            retval["state"].update({const.HUE_ATTR_BRI: latest_brightness})
+            light_type = "Dimmable light"
+            extra_state = {}
         else:
             # On/off light (Zigbee Device ID: 0x0000)
             # Supports groups, scenes, on/off control
-            retval.update(self.hue.config.definitions["lights"]["On/off light"])
+            light_type = "On/off light"
+            extra_state = {}
+        retval.update(self._light_definitions[light_type])
+        light_state = retval["state"]
+        for hue_attr in LIGHT_TYPE_STATE_ATTRS[light_type]:
+            light_state[hue_attr] = latest_state[hue_attr]
+        light_state.update(extra_state)
+
+        if HUE_ATTR_CT in light_state:
+            # get color temperature min/max values from HA attributes
+            # copy the nested dicts first, the definitions are shared between lights
+            capabilities = retval["capabilities"] = retval["capabilities"].copy()
+            control = capabilities["control"] = capabilities["control"].copy()
+            control["ct"] = {
+                **control["ct"],
+                "min": entity_attr.get("min_mireds", 153),
+                "max": entity_attr.get("max_mireds", 500),
+            }
 
         # Get device type, model etc. from the Hass device registry
         reg_entity = self.hue.hass.entity_registry.get(entity["entity_id"])
         if reg_entity and reg_entity["device_id"] is not None:
-            device = self.hue.hass.device_registry.get(reg_entity["device_id"])
-            if device:
-                retval["manufacturername"] = device["manufacturer"]
-                retval["modelid"] = device["model"]
-                retval["productname"] = device["name"]
-                if device["sw_version"]:
-                    retval["swversion"] = device["sw_version"]
-                if device["identifiers"]:
-                    identifiers = device["identifiers"]
-                    if isinstance(identifiers, dict):
-                        # prefer real zigbee address if we have that
-                        # might come in handy later when we want to
-                        # send entertainment packets to the zigbee mesh
-                        for key, value in device["identifiers"]:
-                            if key == "zha":
-                                retval["uniqueid"] = value
-                    elif isinstance(identifiers, list):
-                        # simply grab the first available identifier for now
-                        # may inprove this in the future
-                        for identifier in identifiers:
-                            if isinstance(identifier, list):
-                                retval["uniqueid"] = identifier[-1]
-                                break
-                            elif isinstance(identifier, str):
-                                retval["uniqueid"] = identifier
-                                break
-
-        # Write new state to light config
-        light_config["state"] = retval.get("state")
-        await self.config.async_set_storage_value("lights", light_id, light_config)
+            retval.update(self.__get_device_details(reg_entity["device_id"]))
+
+        # Write new state to light config, but only if it actually changed
+        # the Hue apps poll this very frequently so avoid needless config saves
+        new_state = retval.get("state")
+        if light_config.get("state") != new_state:
+            light_config["state"] = new_state
+            await self.config.async_set_storage_value("lights", light_id, light_config)
 
         return retval
 
+    def __get_device_details(self, device_id: str) -> dict:
+        """Return the Hue light details for a device in the Hass device registry."""
+        device = self.hue.hass.device_registry.get(device_id)
+        if not device:
+            return {}
+        # registry updates replace the device entry, so only parse each entry once
+        cached = self._device_details.get(device_id)
+        if cached and cached[0] is device:
+            return cached[1]
+        details = {
+            "manufacturername": device["manufacturer"],
+            "modelid": device["model"],
+            "productname": device["name"],
+        }
+        if device["sw_version"]:
+            details["swversion"] = device["sw_version"]
+        if device["identifiers"]:
+            identifiers = device["identifiers"]
+            if isinstance(identifiers, dict):
+                # prefer real zigbee address if we have that
+                # might come in handy later when we want to
+                # send entertainment packets to the zigbee mesh
+                zha_id = identifiers.get("zha")
+                if zha_id:
+                    details["uniqueid"] = zha_id
+            elif isinstance(identifiers, list):
+                # simply grab the first available identifier for now
+                # may inprove this in the future
+                for identifier in identifiers:
+                    if isinstance(identifier, list):
+                        details["uniqueid"] = identifier[-1]
+                        break
+                    elif isinstance(identifier, str):
+                        details["uniqueid"] = identifier
+                        break
+        self._device_details[device_id] = (device, details)
+        return details
+
     async def __async_get_all_lights(self) -> dict:
         """Create a dict of all lights."""
         result = {}
@@ -982,13 +1077,13 @@ class HueApi:
             result[group_id]["name"] = group_conf["name"] or area["name"]
             lights_on = 0
             # get all entities for this device
+            # the group lights are yielded with their current state already
             async for entity in self.__async_get_group_lights(group_id):
-                entity = self.hue.hass.get_state(entity["entity_id"], attribute=None)
                 light_id = await self.config.async_entity_id_to_light_id(
                     entity["entity_id"]
                 )
                 result[group_id]["lights"].append(light_id)
-                if entity["state"] == const.HASS_STATE_ON:
+                if entity["state"] == HASS_STATE_ON:
                     lights_on += 1
                     if lights_on == 1:
                         # set state of first light as group state
@@ -1072,7 +1167,7 @@ class HueApi:
 
     async def __async_get_bridge_config(self, full_details: bool = False) -> dict:
         """Return the (virtual) bridge configuration."""
-        result = self.hue.config.definitions.get("bridge").get("basic").copy()
+        result = self.config.definitions.get("bridge").get("basic").copy()
         result.update(
             {
                 "name": self.config.bridge_name,
@@ -1081,7 +1176,7 @@ class HueApi:
             }
         )
         if full_details:
-            result.update(self.hue.config.definitions.get("bridge").get("full"))
+            result.update(self.config.definitions.get("bridge").get("full"))
             result.update(
                 {
                     "linkbutton": self.config.link_mode_enabled,
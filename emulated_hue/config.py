@@ -4,6 +4,7 @@ import datetime
 import hashlib
 import logging
 import os
+import time
 from typing import TYPE_CHECKING, Any, Optional
 
 from getmac import get_mac_address
@@ -45,6 +46,11 @@ class Config:
         self._definitions = load_json(DEFINITIONS_FILE)
         self._link_mode_enabled = False
         self._link_mode_discovery_key = None
+        # counters for the next free light/group id, initialized on first use
+        self._next_item_ids = {}
+        # memoized lookups of hass entity/area ids to light/group ids
+        self._light_ids = {}
+        self._group_ids = {}
 
         # Get the IP address that will be passed to during discovery
         self._ip_addr = get_local_ip()
@@ -84,10 +90,13 @@ class Config:
         self._saver_task = None  # type: asyncio.Task | None
 
     async def _background_saver(self) -> None:
-        last_save = 0
+        # allow the first save right away
+        last_save = time.monotonic() - CONFIG_WRITE_INTERVAL_SECONDS
         while not self._interrupted:
-            now = datetime.datetime.now().timestamp()
+            now = time.monotonic()
             if self._need_save and now - last_save > CONFIG_WRITE_INTERVAL_SECONDS:
+                # reset the flag before saving so changes made meanwhile are kept
+                self._need_save = False
                 await async_save_json(self.get_path(CONFIG_FILE), self._config)
                 last_save = now
             await asyncio.sleep(1)
@@ -151,16 +160,30 @@ class Config:
         """Get path to file at data location."""
         return os.path.join(self.data_path, filename)
 
+    def _get_next_item_id(self, key: str, items: dict) -> str:
+        """Return the next free (numeric) id for items of the given storage key."""
+        next_id = self._next_item_ids.get(key)
+        if next_id is None:
+            # only determine the highest id once, count up from there
+            next_id = max((int(k) for k in items), default=0) + 1
+        # skip ids which have been claimed by (local) items in the meantime
+        while str(next_id) in items:
+            next_id += 1
+        self._next_item_ids[key] = next_id + 1
+        return str(next_id)
+
     async def async_entity_id_to_light_id(self, entity_id: str) -> str:
         """Get a unique light_id number for the hass entity id."""
         lights = await self.async_get_storage_value("lights", default={})
+        light_id = self._light_ids.get(entity_id)
+        if light_id and lights.get(light_id, {}).get("entity_id") == entity_id:
+            return light_id
         for key, value in lights.items():
             if entity_id == value["entity_id"]:
+                self._light_ids[entity_id] = key
                 return key
         # light does not yet exist in config, create default config
-        next_light_id = "1"
-        if lights:
-            next_light_id = str(max(int(k) for k in lights) + 1)
+        next_light_id = self._get_next_item_id("lights", lights)
         # generate unique id (fake zigbee address) from entity id
         unique_id = hashlib.md5(entity_id.encode()).hexdigest()
         unique_id = "00:{}:{}:{}:{}:{}:{}:{}-{}".format(
@@ -190,6 +213,7 @@ class Config:
             "throttle": DEFAULT_THROTTLE_MS,
         }
         await self.async_set_storage_value("lights", next_light_id, light_config)
+        self._light_ids[entity_id] = next_light_id
         return next_light_id
 
     async def async_get_light_config(self, light_id: str) -> dict:
@@ -213,13 +237,15 @@ class Config:
     async def async_area_id_to_group_id(self, area_id: str) -> str:
         """Get a unique group_id number for the hass area_id."""
         groups = await self.async_get_storage_value("groups", default={})
+        group_id = self._group_ids.get(area_id)
+        if group_id and groups.get(group_id, {}).get("area_id") == area_id:
+            return group_id
         for key, value in groups.items():
             if area_id == value.get("area_id"):
+                self._group_ids[area_id] = key
                 return key
         # group does not yet exist in config, create default config
-        next_group_id = "1"
-        if groups:
-            next_group_id = str(max(int(k) for k in groups) + 1)
+        next_group_id = self._get_next_item_id("groups", groups)
         group_config = {
             "area_id": area_id,
             "enabled": True,
@@ -232,6 +258,7 @@ class Config:
             "state": {"any_on": False, "all_on": False},
         }
         await self.async_set_storage_value("groups", next_group_id, group_config)
+        self._group_ids[area_id] = next_group_id
         return next_group_id
 
     async def async_get_group_config(self, group_id: str) -> dict:
@@ -44,8 +44,8 @@ class EntertainmentAPI:
         self.group_details = group_details
         self._interrupted = False
         self._socket_daemon = None
-        self._timestamps = {}
-        self._prev_data = {}
+        # last packet data and throttle deadline per light, kept in one lookup
+        self._prev_state = {}
         self._user_details = user_details
         self.hue.loop.create_task(self.async_run())
 
@@ -111,8 +111,11 @@ class EntertainmentAPI:
         # TODO: can we send udp messages to supported lights such as esphome or native ZHA ?
         # For now we simply unpack the entertainment packet and forward
         # individual commands to lights by calling hass services.
-        throttle_ms = light_conf.get("throttle", DEFAULT_THROTTLE_MS)
-        if not self.__update_allowed(light_id, light_data, throttle_ms):
+        # the stored throttle may be null, treat that as no throttling
+        throttle_ms = light_conf.get("throttle") or DEFAULT_THROTTLE_MS
+        throttle_s = throttle_ms / 1000
+        throttle_ns = int(throttle_ms * 1000000)
+        if not self.__update_allowed(light_id, light_data, throttle_ns):
             return
 
         entity_id = light_conf["entity_id"]
@@ -136,32 +139,30 @@ class EntertainmentAPI:
             )
 
         # update allowed within throttling, push to light
-        if throttle_ms:
-            svc_data[HASS_ATTR_TRANSITION] = throttle_ms / 1000
-        else:
-            svc_data[HASS_ATTR_TRANSITION] = 0
+        svc_data[HASS_ATTR_TRANSITION] = throttle_s
         await self.hue.hass.call_service("light", "turn_on", svc_data)
         self.hue.hass.states[entity_id]["attributes"].update(svc_data)
 
     def __update_allowed(
-        self, light_id: str, light_data: bytes, throttle_ms: int
+        self, light_id: str, light_data: bytes, throttle_ns: int
     ) -> bool:
         """Minimalistic form of throttling, only allow updates to a light within a timespan."""
 
         # check if data changed
         # when not using udp no need to send same light command again
-        prev_data = self._prev_data.get(light_id, b"")
+        prev_data, deadline = self._prev_state.get(light_id, (b"", 0))
         if prev_data == light_data:
             return False
-        self._prev_data[light_id] = light_data
         # check throttle timestamp so light commands are only sent once every X milliseconds
         # this is to not overload a light implementation in Home Assistant
-        if not throttle_ms:
+        # the time at which the next command is allowed is stored as integer ns
+        if not throttle_ns:
+            self._prev_state[light_id] = (light_data, deadline)
             return True
-        prev_timestamp = self._timestamps.get(light_id, 0)
-        cur_timestamp = int(time.time() * 1000)
-        if (cur_timestamp - prev_timestamp) >= throttle_ms:
+        cur_timestamp = time.monotonic_ns()
+        if cur_timestamp >= deadline:
             # change allowed only if within throttle limit
-            self._timestamps[light_id] = cur_timestamp
+            self._prev_state[light_id] = (light_data, cur_timestamp + throttle_ns)
             return True
+        self._prev_state[light_id] = (light_data, deadline)
         return False